@@ -0,0 +1,371 @@
+"""Fleet dashboard that federates many webserver.py hive instances.
+
+Each hive is polled over one persistent HTTP/1.1 connection, so the load on
+every Pi stays constant regardless of how many people view the fleet page.
+
+Usage: python aggregator.py north=10.0.0.11:7123 south=10.0.0.12:7123
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import socketserver
+import threading
+import time
+from collections import deque
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from threading import Lock
+
+# Configuration
+PORT = 7200
+POLL_INTERVAL = 1  # seconds
+CONNECT_TIMEOUT = 3  # seconds
+REQUEST_TIMEOUT = 5  # seconds
+BACKOFF_BASE = 2  # seconds, doubled per consecutive failure
+BACKOFF_MAX = 60  # seconds
+KEEPALIVE_TIMEOUT = 30  # seconds an idle viewer connection is held open
+HISTORY_LENGTH = 3600  # samples kept per hive
+PAGE_HISTORY = 100  # samples per hive sent to the dashboard
+
+# Global state
+hives = []
+fleet_json = b'{"hives": []}'
+fleet_lock = Lock()
+
+FLEET_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>HiveHealth Fleet</title>
+    <link href="https://fonts.googleapis.com/css2?family=Roboto+Condensed:wght@400;700&display=swap" rel="stylesheet">
+    <style>
+        :root {
+            --honey-gold: #FFB347;
+            --hive-brown: #6B4423;
+            --comb-yellow: #F4D03F;
+            --healthy-green: #82C341;
+            --alert-red: #E74C3C;
+        }
+        body {
+            margin: 0;
+            padding: 0;
+            background: linear-gradient(45deg, #fff5e6, #fff);
+            font-family: 'Roboto Condensed', sans-serif;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        .header {
+            background: var(--hive-brown);
+            padding: 1rem;
+            color: var(--comb-yellow);
+            text-align: center;
+            border-radius: 10px;
+            margin-bottom: 20px;
+        }
+        .hives {
+            display: flex;
+            flex-wrap: wrap;
+            justify-content: center;
+            gap: 20px;
+        }
+        .hive {
+            padding: 15px;
+            background: white;
+            border-radius: 10px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+            min-width: 200px;
+            text-align: center;
+            border-top: 5px solid var(--healthy-green);
+        }
+        .hive.offline { border-top-color: var(--alert-red); opacity: 0.6; }
+        .hive a { color: var(--hive-brown); }
+        .status { font-size: 0.8em; color: #888; }
+        .chart-container {
+            background: white;
+            padding: 20px;
+            border-radius: 10px;
+            margin: 20px 0;
+        }
+    </style>
+    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    <script>
+        let chart;
+        const colors = ['#FFB347', '#3498db', '#82C341', '#E74C3C', '#9B59B6', '#6B4423'];
+        function initChart() {
+            const ctx = document.getElementById('chart').getContext('2d');
+            chart = new Chart(ctx, {
+                type: 'line',
+                data: { datasets: [] },
+                options: {
+                    responsive: true,
+                    scales: {
+                        x: { type: 'time', time: { tooltipFormat: 'HH:mm' } },
+                        y: { beginAtZero: false }
+                    }
+                }
+            });
+        }
+        function renderHive(hive) {
+            const age = hive.last_seen ? Math.round(Date.now() / 1000 - hive.last_seen) : null;
+            const status = hive.online ? 'online' : (age === null ? 'never reached' : `offline, last seen ${age}s ago`);
+            return `<div class="hive ${hive.online ? '' : 'offline'}">
+                <h3><a href="${hive.url}">${hive.name}</a></h3>
+                <div>${hive.temperature === null ? '--' : hive.temperature.toFixed(1)}°F</div>
+                <div>${hive.humidity === null ? '--' : hive.humidity.toFixed(1)}%</div>
+                <div>Activity: ${hive.count === null ? '--' : hive.count}</div>
+                <div class="status">${status}</div>
+            </div>`;
+        }
+        function updateFleet() {
+            fetch('/fleet')
+                .then(r => r.json())
+                .then(data => {
+                    document.getElementById('hives').innerHTML = data.hives.map(renderHive).join('');
+                    chart.data.datasets = data.hives.map((hive, i) => ({
+                        label: `${hive.name} (°F)`,
+                        borderColor: colors[i % colors.length],
+                        tension: 0.3,
+                        data: hive.history.map(d => ({ x: d.time * 1000, y: d.temperature }))
+                    }));
+                    chart.update();
+                });
+        }
+        setInterval(updateFleet, 1000);
+        window.onload = () => { initChart(); updateFleet(); };
+    </script>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🐝 Apiary Fleet Monitor</h1>
+        </div>
+        <div class="hives" id="hives"></div>
+        <div class="chart-container">
+            <canvas id="chart"></canvas>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+class HiveClient:
+    """Keep-alive HTTP/1.1 connection to a single hive server."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), CONNECT_TIMEOUT)
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+        self.reader = self.writer = None
+
+    async def get_json(self, path):
+        # A kept-alive connection may have been closed by the hive while idle,
+        # so a failure on a reused connection gets one retry on a fresh one.
+        for attempt in range(2):
+            reused = self.writer is not None
+            try:
+                if not reused:
+                    await self.connect()
+                return await asyncio.wait_for(self.request(path), REQUEST_TIMEOUT)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if not reused or attempt:
+                    raise
+            except Exception:
+                await self.close()
+                raise
+
+    async def request(self, path):
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Accept-Encoding: gzip\r\n"
+            "Connection: keep-alive\r\n\r\n".encode())
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by hive")
+        version, status = status_line.decode("latin-1").split()[:2]
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await self.reader.read()
+            keep_alive = False
+        if not keep_alive:
+            await self.close()
+
+        if status != "200":
+            raise ValueError(f"HTTP {status} for {path}")
+        if headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        return json.loads(body)
+
+
+class Hive:
+    def __init__(self, name, host, port):
+        self.name = name
+        self.client = HiveClient(host, port)
+        self.url = f"http://{host}:{port}/"
+        self.latest = None
+        self.history = deque(maxlen=HISTORY_LENGTH)
+        self.online = False
+        self.last_seen = None
+        self.failures = 0
+
+    def merge(self, data):
+        last_time = self.history[-1]["time"] if self.history else 0
+        self.history.extend(r for r in data["history"] if r["time"] > last_time)
+        self.latest = data
+        self.online = True
+        self.last_seen = time.time()
+        self.failures = 0
+
+    def summary(self):
+        return {
+            "name": self.name,
+            "url": self.url,
+            "online": self.online,
+            "last_seen": self.last_seen,
+            "temperature": self.latest["temperature"] if self.latest else None,
+            "humidity": self.latest["humidity"] if self.latest else None,
+            "count": self.latest["count"] if self.latest else None,
+            "next_snapshot": self.latest["next_snapshot"] if self.latest else None,
+            "history": list(self.history)[-PAGE_HISTORY:],
+        }
+
+
+async def poll_hive(hive):
+    while True:
+        started = time.monotonic()
+        path = f"/sensors?since={hive.history[-1]['time']}" if hive.history else "/sensors"
+        try:
+            hive.merge(await hive.client.get_json(path))
+            # Successful polls stay on a fixed grid
+            delay = max(0, POLL_INTERVAL - (time.monotonic() - started))
+        except Exception as e:
+            # Back off for the full delay, however long the failed attempt took
+            hive.failures += 1
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (hive.failures - 1))
+            if hive.online or hive.failures == 1:
+                logging.warning("Hive %s unreachable (%s), retrying in %ss", hive.name, str(e) or type(e).__name__, delay)
+            hive.online = False
+        await asyncio.sleep(delay)
+
+
+async def publish_fleet():
+    # Viewers only ever read this cached document, never the hives directly
+    global fleet_json
+    while True:
+        data = json.dumps({"time": time.time(), "hives": [hive.summary() for hive in hives]}).encode()
+        with fleet_lock:
+            fleet_json = data
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+async def poll_fleet():
+    await asyncio.gather(publish_fleet(), *(poll_hive(hive) for hive in hives))
+
+
+class FleetHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+
+    def do_GET(self):
+        try:
+            if self.path == '/':
+                self.send_redirect('/index.html')
+            elif self.path == '/index.html':
+                self.serve_html()
+            elif self.path == '/fleet':
+                self.serve_fleet()
+            else:
+                self.send_error(404)
+        except Exception as e:
+            logging.error("Request error: %s", e)
+            self.send_error(500)
+
+    def serve_html(self):
+        body = FLEET_PAGE.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', len(body))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def serve_fleet(self):
+        with fleet_lock:
+            body = fleet_json
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', len(body))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_redirect(self, location):
+        self.send_response(301)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', 0)
+        self.end_headers()
+
+
+def parse_hive(spec):
+    # name=host:port, host:port or host (default hive port)
+    name, _, address = spec.rpartition("=")
+    host, _, port = address.partition(":")
+    return Hive(name or address, host, int(port or 7123))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Serve one dashboard for many hive servers")
+    parser.add_argument("hives", nargs="+", help="name=host:port of each hive server")
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+    hives = [parse_hive(spec) for spec in args.hives]
+
+    threading.Thread(target=asyncio.run, args=(poll_fleet(),), daemon=True).start()
+
+    class ThreadedHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+        pass
+
+    server = ThreadedHTTPServer(('', args.port), FleetHandler)
+    server.daemon_threads = True
+
+    logging.info(f"Fleet server started on port {args.port} for {len(hives)} hives")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down")
+    finally:
+        server.server_close()
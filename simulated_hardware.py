@@ -0,0 +1,126 @@
+"""Stand-ins for the Pi hardware so webserver.py can run on any machine.
+
+Enabled with HIVE_SIMULATE=1. The classes mimic just enough of the
+adafruit_sht4x, adafruit_dotstar and picamera2 APIs used by webserver.py.
+"""
+import math
+import random
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class SimulatedSHT4x:
+    """Slow daily temperature/humidity cycle with a little sensor noise."""
+
+    def __init__(self):
+        self.phase = random.uniform(0, 2 * math.pi)
+
+    def _cycle(self):
+        return math.sin(time.time() / 86400 * 2 * math.pi + self.phase)
+
+    @property
+    def temperature(self):
+        return 34.0 + 1.5 * self._cycle() + random.gauss(0, 0.05)
+
+    @property
+    def relative_humidity(self):
+        return 60.0 - 8.0 * self._cycle() + random.gauss(0, 0.2)
+
+    @property
+    def measurements(self):
+        return self.temperature, self.relative_humidity
+
+    def reset(self):
+        pass
+
+
+class SimulatedDotStar:
+    def __init__(self, count=4, brightness=0.2):
+        self.pixels = [(0, 0, 0)] * count
+        self.brightness = brightness
+
+    def fill(self, color):
+        self.pixels = [color] * len(self.pixels)
+
+
+class JpegEncoder:
+    pass
+
+
+def FileOutput(output):
+    # Picamera2 wraps the output; the simulated camera writes to it directly
+    return output
+
+
+class SimulatedRequest:
+    def __init__(self, array):
+        self.array = array
+
+    def make_array(self, name):
+        return self.array
+
+    def release(self):
+        pass
+
+
+class Picamera2:
+    """Renders a red 'bee' orbiting the frame so the detector has work to do."""
+
+    FRAME_RATE = 10
+
+    def __init__(self):
+        self.started = False
+        self.config = None
+        self.output = None
+        self.thread = None
+
+    def create_video_configuration(self, main):
+        return {"main": main}
+
+    def create_still_configuration(self, main):
+        return {"main": main}
+
+    def configure(self, config):
+        self.config = config
+
+    def render(self):
+        width, height = self.config["main"]["size"]
+        img = np.full((height, width, 3), (35, 68, 107), np.uint8)
+        angle = time.time() % (2 * math.pi)
+        center = (int(width / 2 + width / 4 * math.cos(angle)),
+                  int(height / 2 + height / 4 * math.sin(angle)))
+        cv2.circle(img, center, max(width, height) // 20, (0, 0, 255), -1)
+        return img
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+    def start_recording(self, encoder, output):
+        self.output = output
+        self.started = True
+        self.thread = threading.Thread(target=self.record, daemon=True)
+        self.thread.start()
+
+    def stop_recording(self):
+        self.started = False
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def record(self):
+        while self.started:
+            _, jpeg = cv2.imencode('.jpg', self.render())
+            self.output.write(jpeg.tobytes())
+            time.sleep(1 / self.FRAME_RATE)
+
+    def capture_request(self):
+        return SimulatedRequest(cv2.cvtColor(self.render(), cv2.COLOR_BGR2RGB))
+
+    def close(self):
+        self.stop_recording()
@@ -1,4 +1,6 @@
 import io
+import gzip
+import hashlib
 import logging
 import socketserver
 import json
@@ -6,39 +8,85 @@ import time
 import threading
 import os
 import math
+import signal
 from collections import deque
+from itertools import islice
 from datetime import datetime
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from threading import Condition, Lock, RLock
-import cv2
-import numpy as np
-import board
-import adafruit_sht4x
-import adafruit_dotstar as dotstar
-from picamera2 import Picamera2
-from picamera2.encoders import JpegEncoder
-from picamera2.outputs import FileOutput
+from threading import Condition, Event, Lock, RLock
+from urllib.parse import urlparse, parse_qs
+
+def process_start_time():
+    """Return the process start as a time.monotonic() value.
+
+    Startup metrics are timed from here so they include interpreter start
+    and module imports; falls back to module load time off Linux.
+    """
+    now = time.monotonic()
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rpartition(")")[2].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")  # seconds after boot
+        return now - (time.clock_gettime(time.CLOCK_BOOTTIME) - started)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return now
+
+START_TIME = process_start_time()
 
 # Configuration
-SNAPSHOT_ROOT = "snapshots"
+SNAPSHOT_ROOT = os.environ.get("HIVE_SNAPSHOT_ROOT", "snapshots")
 STREAM_CONFIG = {"size": (640, 640), "format": "XRGB8888"}
 STILL_CONFIG = {"size": (2304, 1746), "format": "XRGB8888"}
 SNAPSHOT_INTERVAL = 60  # seconds
-PORT = 7123
+PORT = int(os.environ.get("HIVE_PORT", 7123))
+SIMULATE = os.environ.get("HIVE_SIMULATE") == "1"  # Run without Pi hardware
+MAX_DELTA_SAMPLES = 3600  # Cap on history returned for /sensors?since=
+KEEPALIVE_TIMEOUT = 30  # seconds an idle keep-alive connection is held open
+GZIP_MIN_SIZE = 1024  # bytes; smaller JSON responses are sent uncompressed
+GZIP_LEVEL = 5
+# Hz, aggregated to 1-second records; clamped to what the SHT4x can sustain
+SENSOR_SAMPLE_RATE = min(10.0, max(1.0, float(os.environ.get("HIVE_SAMPLE_RATE", 5))))
+SENSOR_RETRIES = 3  # immediate retries before backing off
+SENSOR_BACKOFF_BASE = 1  # seconds, doubled per consecutive failure
+SENSOR_BACKOFF_MAX = 60  # seconds
+# One <YYYYMMDD>.jsonl per day, kept out of SNAPSHOT_ROOT so /snapshot/ never serves it
+SENSOR_LOG_ROOT = os.environ.get("HIVE_SENSOR_LOG_ROOT", "sensor_log")
+SENSOR_FLUSH_INTERVAL = 60  # seconds between appends of buffered records to disk
+# Each day's log is ~13 MB; only the last 24h is reloaded, so older logs are pruned
+SENSOR_LOG_RETENTION_DAYS = 2
+CAMERA_WAIT_TIMEOUT = 30  # seconds a stream request waits for the camera to start
+CAMERA_BACKOFF_BASE = 2  # seconds, doubled per failed camera start
+CAMERA_BACKOFF_MAX = 60  # seconds
 
-
-# Initialize hardware
 os.makedirs(SNAPSHOT_ROOT, exist_ok=True)
-sht = adafruit_sht4x.SHT4x(board.I2C())
-dots = dotstar.DotStar(board.SCK, board.MOSI, 4, brightness=0.2)
+os.makedirs(SENSOR_LOG_ROOT, exist_ok=True)
+
+# Hardware and heavy modules are loaded in the background by sensor_loop and
+# start_camera so the HTTP server can bind immediately
+sht = None
+dots = None
+cv2 = None
+np = None
+Picamera2 = None
+JpegEncoder = None
+FileOutput = None
 
 # Global state
 streaming_enabled = True
 sensor_data = deque(maxlen=86400)
 data_lock = Lock()
+latest_reading = None  # Most recent 1-second record, replaced atomically by sensor_loop
+sensor_log_pending = []  # Records not yet written to disk, guarded by data_lock
+sensor_log_lock = Lock()  # Serializes flushes from the log and main threads
+camera_manager = None
+camera_ready = Event()
+camera_status = "starting"  # starting, retrying, ready, or failed (permanently)
 camera_lock = RLock()
 next_snapshot_time = time.time() + SNAPSHOT_INTERVAL  # Initialize next snapshot time
 snapshot_lock = Lock()
+snapshot_index = {}  # day -> snapshot metadata records
+index_lock = Lock()
+startup_metrics = {}  # event -> seconds since START_TIME
 
 PAGE = """<!DOCTYPE html>
 <html>
@@ -235,18 +283,36 @@ PAGE = """<!DOCTYPE html>
 </html>
 """
 
+# Encode and compress the dashboard once rather than on every request
+PAGE_BODY = PAGE.encode()
+PAGE_GZIP = gzip.compress(PAGE_BODY, compresslevel=9)
+# Weak, since the same tag covers both the plain and gzip encodings
+PAGE_ETAG = 'W/"%s"' % hashlib.sha1(PAGE_BODY).hexdigest()[:16]
+
+def mark_startup(event):
+    """Record how long after START_TIME `event` first happened."""
+    if event not in startup_metrics:
+        startup_metrics[event] = round(time.monotonic() - START_TIME, 3)
+        logging.info("Startup: %s after %.3fs", event, startup_metrics[event])
+
 class CameraManager:
     def __init__(self):
         self.picam2 = Picamera2()
-        self.output = StreamingOutput()
         self.current_mode = None
-        
-        # Initialize both configurations
-        self.video_config = self.picam2.create_video_configuration(main=STREAM_CONFIG)
-        self.still_config = self.picam2.create_still_configuration(main=STILL_CONFIG)
-        
-        # Start with video mode
-        self.switch_to_video()
+        self.still_config = None
+
+        # Release the camera on any setup failure so a retry can open it
+        try:
+            self.output = StreamingOutput()
+
+            # The still configuration is only built when the first snapshot needs it
+            self.video_config = self.picam2.create_video_configuration(main=STREAM_CONFIG)
+
+            # Start with video mode
+            self.switch_to_video()
+        except Exception:
+            self.picam2.close()
+            raise
 
     def switch_to_video(self):
         with camera_lock:
@@ -275,6 +341,8 @@ class CameraManager:
                     time.sleep(0.5)  # Give time for camera to settle
                 
                 # Configure for still capture
+                if self.still_config is None:
+                    self.still_config = self.picam2.create_still_configuration(main=STILL_CONFIG)
                 self.picam2.configure(self.still_config)
                 time.sleep(0.5)  # Give time for camera to adjust to new settings
                 
@@ -395,28 +463,37 @@ class StreamingOutput(io.BufferedIOBase):
         with self.condition:
             self.frame = buf
             self.condition.notify_all()
+        mark_startup("first_frame")
 
     def get_red_count(self):
         return self.red_count
 
 class StreamingHandler(BaseHTTPRequestHandler):
+    # Keep connections open so the dashboard's 1-second polls reuse them
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+
     def do_GET(self):
         try:
-            if self.path == '/':
+            url = urlparse(self.path)
+            path = url.path
+            if path == '/':
                 self.send_redirect('/index.html')
-            elif self.path == '/index.html':
+            elif path == '/index.html':
                 self.serve_html()
-            elif self.path == '/stream.mjpg':
+            elif path == '/stream.mjpg':
                 self.serve_stream()
-            elif self.path == '/sensors':
-                self.serve_sensor_data()
-            elif self.path == '/count':
+            elif path == '/sensors':
+                self.serve_sensor_data(parse_qs(url.query))
+            elif path == '/count':
                 self.serve_red_count()
-            elif self.path == '/toggle':
+            elif path == '/toggle':
                 self.toggle_stream()
-            elif self.path == '/snapshots':
+            elif path == '/status':
+                self.serve_status()
+            elif path == '/snapshots':
                 self.serve_snapshots()
-            elif self.path.startswith('/snapshot/'):
+            elif path.startswith('/snapshot/'):
                 self.serve_snapshot_image()
             else:
                 self.send_error(404)
@@ -425,17 +502,42 @@ class StreamingHandler(BaseHTTPRequestHandler):
             self.send_error(500)
 
     def serve_html(self):
+        if PAGE_ETAG in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', PAGE_ETAG)
+            self.end_headers()
+            return
+
+        gzipped = self.accepts_gzip()
+        body = PAGE_GZIP if gzipped else PAGE_BODY
         self.send_response(200)
         self.send_header('Content-Type', 'text/html')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('ETag', PAGE_ETAG)
+        self.send_header('Vary', 'Accept-Encoding')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', len(body))
         self.end_headers()
-        self.wfile.write(PAGE.encode())
+        self.wfile.write(body)
 
     def serve_stream(self):
+        # Wait while the camera is still coming up; a permanent failure answers immediately
+        deadline = time.monotonic() + CAMERA_WAIT_TIMEOUT
+        while camera_status in ("starting", "retrying") and time.monotonic() < deadline:
+            camera_ready.wait(0.5)
+        if not camera_ready.is_set():
+            self.send_error(503, "Camera not ready")
+            return
+
+        # The stream has no length, so it ends by closing the connection
+        self.close_connection = True
         self.send_response(200)
         self.send_header('Age', '0')
         self.send_header('Cache-Control', 'no-cache, private')
         self.send_header('Pragma', 'no-cache')
         self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=FRAME')
+        self.send_header('Connection', 'close')
         self.end_headers()
         
         try:
@@ -453,15 +555,26 @@ class StreamingHandler(BaseHTTPRequestHandler):
         except Exception as e:
             logging.warning("Stream closed: %s", e)
 
-    def serve_sensor_data(self):
+    def serve_sensor_data(self, query):
+        # ?since=<timestamp> returns only newer samples (used by aggregator.py)
+        since = None
+        if "since" in query:
+            try:
+                since = float(query["since"][0])
+            except ValueError:
+                since = None
+            if since is None or not math.isfinite(since):
+                self.send_error(400, "Invalid since timestamp")
+                return
+        latest = latest_reading or {"temperature": 0, "humidity": 0}
         with data_lock:
-            latest = sensor_data[-1] if sensor_data else {"temperature": 0, "humidity": 0}
-            data = {
-                "temperature": latest["temperature"],
-                "humidity": latest["humidity"],
-                "count": camera_manager.output.get_red_count(),
-                "history": list(sensor_data)[-100:]
-            }
+            history = list(islice(reversed(sensor_data), 100))[::-1] if since is None else sensor_history_since(since)
+        data = {
+            "temperature": latest["temperature"],
+            "humidity": latest["humidity"],
+            "count": current_red_count(),
+            "history": history
+        }
 
         # Calculate remaining time until next snapshot
         with snapshot_lock:
@@ -472,11 +585,21 @@ class StreamingHandler(BaseHTTPRequestHandler):
         self.send_json(data)
 
     def serve_red_count(self):
-        count = camera_manager.output.get_red_count()
+        count = current_red_count()
         self.send_json({"count": count})
 
+    def serve_status(self):
+        self.send_json({
+            "camera": camera_status,
+            "uptime": round(time.monotonic() - START_TIME, 3),
+            "startup": startup_metrics
+        })
+
     def toggle_stream(self):
         global streaming_enabled
+        if not camera_ready.is_set():
+            self.send_error(503, "Camera not ready")
+            return
         streaming_enabled = not streaming_enabled
         if streaming_enabled:
             dots.fill((255, 255, 255))  # Turn LEDs on
@@ -519,18 +642,13 @@ class StreamingHandler(BaseHTTPRequestHandler):
                 <img class="modal-content" id="modalImage">
             </div>"""
         
-        for day in sorted(os.listdir(SNAPSHOT_ROOT), reverse=True):
-            day_path = os.path.join(SNAPSHOT_ROOT, day)
-            if not os.path.isdir(day_path):
-                continue
-            
-            metadata_path = os.path.join(day_path, 'data.json')
-            if not os.path.exists(metadata_path):
-                continue
-                
-            with open(metadata_path) as f:
-                records = json.load(f)
-            
+        if "snapshot_index" not in startup_metrics:
+            html += "<p>Still indexing snapshots...</p>"
+
+        with index_lock:
+            days = sorted(snapshot_index.items(), reverse=True)
+
+        for day, records in days:
             html += f'<div class="day"><h2>{day}</h2>'
             for record in records:
                 html += f"""
@@ -544,26 +662,32 @@ class StreamingHandler(BaseHTTPRequestHandler):
             html += '</div>'
         
         html += "</body></html>"
+        body = html.encode()
         self.send_response(200)
         self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', len(body))
         self.end_headers()
-        self.wfile.write(html.encode())
+        self.wfile.write(body)
 
     def serve_snapshot_image(self):
         try:
             path_parts = self.path.split('/')[2:]
-            if len(path_parts) < 2:
+            if len(path_parts) < 2 or not path_parts[-1].endswith('.jpg'):
                 raise ValueError("Invalid path format")
                 
             file_path = os.path.join(SNAPSHOT_ROOT, *path_parts)
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Snapshot not found: {file_path}")
                 
+            with open(file_path, 'rb') as f:
+                body = f.read()
+            # Snapshots never change once written
             self.send_response(200)
             self.send_header('Content-Type', 'image/jpeg')
-            with open(file_path, 'rb') as f:
-                self.end_headers()
-                self.wfile.write(f.read())
+            self.send_header('Cache-Control', 'max-age=86400')
+            self.send_header('Content-Length', len(body))
+            self.end_headers()
+            self.wfile.write(body)
         except (ValueError, FileNotFoundError) as e:
             logging.warning(f"Failed to serve snapshot: {str(e)}")
             self.send_error(404)
@@ -571,34 +695,311 @@ class StreamingHandler(BaseHTTPRequestHandler):
             logging.error(f"Unexpected error serving snapshot: {str(e)}")
             self.send_error(500)
 
+    def accepts_gzip(self):
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+
     def send_json(self, data):
+        body = json.dumps(data).encode()
+        gzipped = len(body) >= GZIP_MIN_SIZE and self.accepts_gzip()
+        if gzipped:
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', len(body))
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
 
     def send_redirect(self, location):
         self.send_response(301)
         self.send_header('Location', location)
+        self.send_header('Content-Length', 0)
         self.end_headers()
 
+def current_red_count():
+    return camera_manager.output.get_red_count() if camera_ready.is_set() else 0
+
+def sensor_history_since(since):
+    """Return samples newer than `since`, oldest first. Caller holds data_lock."""
+    newer = []
+    for record in reversed(sensor_data):
+        if record["time"] <= since or len(newer) >= MAX_DELTA_SAMPLES:
+            break
+        newer.append(record)
+    newer.reverse()
+    return newer
+
+class SensorBackoff:
+    """Retry state machine for sensor read failures.
+
+    A few immediate retries absorb one-off I2C glitches; after that the
+    delay doubles per failure up to SENSOR_BACKOFF_MAX, soft-resetting the
+    sensor before each attempt.
+    """
+    OK = "ok"
+    RETRYING = "retrying"
+    BACKING_OFF = "backing_off"
+
+    def __init__(self):
+        self.state = self.OK
+        self.failures = 0
+        self.delay = 0
+
+    def succeeded(self):
+        if self.state != self.OK:
+            logging.info("Sensor recovered after %d failed reads", self.failures)
+        self.state = self.OK
+        self.failures = 0
+        self.delay = 0
+
+    def failed(self, error):
+        """Record a failure and return how long to wait before the next read."""
+        self.failures += 1
+        if self.failures <= SENSOR_RETRIES:
+            if self.state == self.OK:
+                logging.warning("Sensor read failed, retrying: %s", error)
+            self.state = self.RETRYING
+            return 0
+
+        delay = min(SENSOR_BACKOFF_MAX, SENSOR_BACKOFF_BASE * 2 ** (self.failures - SENSOR_RETRIES - 1))
+        # Log on entering backoff and on reaching the cap, not on every step
+        if self.state != self.BACKING_OFF:
+            logging.error("Sensor error: %s, backing off from %ss", error, delay)
+        elif delay == SENSOR_BACKOFF_MAX and self.delay < SENSOR_BACKOFF_MAX:
+            logging.error("Sensor still failing: %s, retrying every %ss", error, delay)
+        self.state = self.BACKING_OFF
+        self.delay = delay
+        if sht is not None:
+            try:
+                sht.reset()
+            except Exception as e:
+                logging.debug("Sensor reset failed: %s", e)
+        return delay
+
+def init_sensor():
+    global sht
+    if SIMULATE:
+        from simulated_hardware import SimulatedSHT4x
+        sht = SimulatedSHT4x()
+    else:
+        import board
+        import adafruit_sht4x
+        sht = adafruit_sht4x.SHT4x(board.I2C())
+        # Medium precision takes ~5ms per read, leaving headroom at 10 Hz
+        sht.mode = adafruit_sht4x.Mode.NOHEAT_MEDPRECISION
+
+def summarize_samples(temps, hums):
+    return {
+        "time": time.time(),
+        "temperature": sum(temps) / len(temps),
+        "humidity": sum(hums) / len(hums),
+        "temperature_min": min(temps),
+        "temperature_max": max(temps),
+        "humidity_min": min(hums),
+        "humidity_max": max(hums),
+        "samples": len(temps)
+    }
+
 def sensor_loop():
+    global latest_reading
+    interval = 1 / SENSOR_SAMPLE_RATE
+    backoff = SensorBackoff()
+    temps, hums = [], []
+    # Samples are scheduled on a fixed monotonic grid so read time doesn't accumulate
+    next_sample = time.monotonic()
+    publish_at = next_sample + 1
+
     while True:
+        delay = next_sample - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        now = time.monotonic()
+        if now >= publish_at:
+            # One lock and one swap per second, however many samples were taken
+            if temps:
+                record = summarize_samples(temps, hums)
+                with data_lock:
+                    sensor_data.append(record)
+                    sensor_log_pending.append(record)
+                latest_reading = record
+                temps, hums = [], []
+            publish_at += 1
+            if publish_at <= now:
+                publish_at = now + 1
+
         try:
-            temp = sht.temperature * 9/5 + 32
-            hum = sht.relative_humidity
-            
-            with data_lock:
-                sensor_data.append({
-                    "time": time.time(),
-                    "temperature": temp,
-                    "humidity": hum
-                })
-            
-            time.sleep(1)
+            if sht is None:
+                init_sensor()
+            temp_c, hum = sht.measurements
+            temps.append(temp_c * 9/5 + 32)
+            hums.append(hum)
+            backoff.succeeded()
+        except Exception as e:
+            wait = backoff.failed(e)
+            if wait:
+                temps, hums = [], []
+                next_sample = time.monotonic() + wait
+                publish_at = next_sample + 1
+                continue
+
+        now = time.monotonic()
+        next_sample += interval
+        if next_sample <= now:
+            # Overran one or more slots; skip them rather than bursting to catch up
+            next_sample += math.ceil((now - next_sample) / interval) * interval
+
+def sensor_log_loop():
+    # Disk writes and pruning stay off the sampler thread so they can't skip sample slots
+    while True:
+        time.sleep(SENSOR_FLUSH_INTERVAL)
+        flush_sensor_log()
+
+def flush_sensor_log():
+    """Append buffered 1-second records to each day's sensor log."""
+    with sensor_log_lock:
+        with data_lock:
+            pending = sensor_log_pending[:]
+            sensor_log_pending.clear()
+
+        by_day = {}
+        for record in pending:
+            day = datetime.fromtimestamp(record["time"]).strftime("%Y%m%d")
+            by_day.setdefault(day, []).append(record)
+
+        for day, records in by_day.items():
+            try:
+                log_path = os.path.join(SENSOR_LOG_ROOT, f"{day}.jsonl")
+                new_day = not os.path.exists(log_path)
+                with open(log_path, "a") as f:
+                    f.writelines(json.dumps(record) + "\n" for record in records)
+            except Exception as e:
+                logging.error(f"Error saving sensor log: {str(e)}")
+                continue
+            if new_day:
+                prune_sensor_logs()
+
+def prune_sensor_logs():
+    """Delete sensor logs older than SENSOR_LOG_RETENTION_DAYS."""
+    cutoff_day = datetime.fromtimestamp(time.time() - SENSOR_LOG_RETENTION_DAYS * 86400).strftime("%Y%m%d")
+    for filename in os.listdir(SENSOR_LOG_ROOT):
+        day = filename.removesuffix(".jsonl")
+        if day == filename or day >= cutoff_day:
+            continue
+        log_path = os.path.join(SENSOR_LOG_ROOT, filename)
+        try:
+            os.remove(log_path)
+            logging.info(f"Pruned old sensor log {log_path}")
+        except Exception as e:
+            logging.error(f"Error pruning sensor log {log_path}: {str(e)}")
+
+def load_sensor_history():
+    """Refill sensor_data from the last day of sensor logs."""
+    prune_sensor_logs()
+    cutoff = time.time() - sensor_data.maxlen
+    cutoff_day = datetime.fromtimestamp(cutoff).strftime("%Y%m%d")
+    history = []
+    for filename in sorted(os.listdir(SENSOR_LOG_ROOT)):
+        day = filename.removesuffix(".jsonl")
+        if day == filename or day < cutoff_day:
+            continue
+        log_path = os.path.join(SENSOR_LOG_ROOT, filename)
+        try:
+            with open(log_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Partial line from an unclean shutdown
+                    if record["time"] > cutoff:
+                        history.append(record)
+        except Exception as e:
+            logging.error(f"Error loading sensor log {log_path}: {str(e)}")
+
+    # Live samples may already have been recorded; keep them after the history
+    with data_lock:
+        live = list(sensor_data)
+        if live:
+            history = [r for r in history if r["time"] < live[0]["time"]]
+        sensor_data.clear()
+        sensor_data.extend(history)
+        sensor_data.extend(live)
+    mark_startup("sensor_history")
+
+def load_snapshot_index():
+    """Read every day's snapshot metadata into snapshot_index."""
+    index = {}
+    for day in os.listdir(SNAPSHOT_ROOT):
+        metadata_path = os.path.join(SNAPSHOT_ROOT, day, 'data.json')
+        if not os.path.exists(metadata_path):
+            continue
+        try:
+            with open(metadata_path) as f:
+                index[day] = json.load(f)
         except Exception as e:
-            logging.error("Sensor error: %s", e)
-            time.sleep(5)
+            logging.error(f"Error loading snapshot metadata {metadata_path}: {str(e)}")
+
+    with index_lock:
+        for day, records in index.items():
+            snapshot_index.setdefault(day, records)
+    mark_startup("snapshot_index")
+
+def load_camera_modules():
+    global cv2, np, Picamera2, JpegEncoder, FileOutput
+    import cv2
+    import numpy as np
+    if SIMULATE:
+        from simulated_hardware import Picamera2, JpegEncoder, FileOutput
+    else:
+        from picamera2 import Picamera2
+        from picamera2.encoders import JpegEncoder
+        from picamera2.outputs import FileOutput
+
+def start_camera():
+    """Load the camera stack and start recording, then begin snapshots.
+
+    Failed starts are retried with backoff, e.g. while a previous process
+    is still releasing the camera after a restart. A missing camera stack
+    can't be fixed by retrying, so it fails permanently.
+    """
+    global camera_manager, camera_status, dots
+    failures = 0
+    while True:
+        try:
+            load_camera_modules()
+        except ImportError as e:
+            camera_status = "failed"
+            logging.error(f"Camera modules unavailable: {str(e)}")
+            return
+
+        try:
+            if dots is None:
+                if SIMULATE:
+                    from simulated_hardware import SimulatedDotStar
+                    dots = SimulatedDotStar(4, brightness=0.2)
+                else:
+                    import board
+                    import adafruit_dotstar as dotstar
+                    dots = dotstar.DotStar(board.SCK, board.MOSI, 4, brightness=0.2)
+
+            camera_manager = CameraManager()
+            break
+        except Exception as e:
+            failures += 1
+            camera_status = "retrying"
+            delay = min(CAMERA_BACKOFF_MAX, CAMERA_BACKOFF_BASE * 2 ** (failures - 1))
+            logging.error(f"Camera initialization failed: {str(e)}, retrying in {delay}s")
+            time.sleep(delay)
+
+    if failures:
+        logging.info(f"Camera started after {failures} failed attempts")
+    camera_status = "ready"
+    camera_ready.set()
+    mark_startup("camera_ready")
+    threading.Thread(target=snapshot_loop, daemon=True).start()
 
 def snapshot_loop():
     global next_snapshot_time
@@ -625,8 +1026,7 @@ def snapshot_loop():
             logging.info("Image captured successfully, processing...")
             
             # Add overlay
-            with data_lock:
-                latest = sensor_data[-1] if sensor_data else {"temperature": 0, "humidity": 0}
+            latest = latest_reading or {"temperature": 0, "humidity": 0}
             
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             cv2.putText(img, f"Temp: {latest['temperature']:.1f}°F", (10, 30), 
@@ -670,6 +1070,8 @@ def snapshot_loop():
                 
                 with open(metadata_file, "w") as f:
                     json.dump(existing, f)
+                with index_lock:
+                    snapshot_index[os.path.basename(date_folder)] = existing
                 
                 logging.info(f"Successfully saved snapshot: {filename}")
             except Exception as e:
@@ -699,20 +1101,30 @@ if __name__ == "__main__":
         ]
     )
 
-    camera_manager = None
+    # systemd and kill send SIGTERM; route it through the same cleanup as Ctrl+C
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
     server = None
     
     try:
-        camera_manager = CameraManager()
-        
-        threading.Thread(target=sensor_loop, daemon=True).start()
-        threading.Thread(target=snapshot_loop, daemon=True).start()
-
         class ThreadedHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
             pass
 
+        # Bind first so the dashboard and sensor endpoints answer while the
+        # camera and persisted state load in the background. From here the
+        # server can respond, so "listening" is the time-to-first-response.
         server = ThreadedHTTPServer(('', PORT), StreamingHandler)
         server.daemon_threads = True
+        mark_startup("listening")
+
+        threading.Thread(target=sensor_loop, daemon=True).start()
+        threading.Thread(target=sensor_log_loop, daemon=True).start()
+        threading.Thread(target=start_camera, daemon=True).start()
+        threading.Thread(target=load_sensor_history, daemon=True).start()
+        threading.Thread(target=load_snapshot_index, daemon=True).start()
         
         logging.info(f"Server started on port {PORT}")
         server.serve_forever()
@@ -721,6 +1133,8 @@ if __name__ == "__main__":
     except Exception as e:
         logging.error(f"Unexpected error: {str(e)}")
     finally:
+        flush_sensor_log()
+
         if camera_manager:
             try:
                 camera_manager.picam2.stop_recording()